@@ -80,6 +80,24 @@ async function updateQueueInfo() {
   }
 }
 
+// Poll a background send until it finishes
+async function waitForTask(serverUrl, taskId) {
+  const POLL_INTERVAL_MS = 1500;
+  const MAX_POLLS = 120;
+
+  for (let i = 0; i < MAX_POLLS; i++) {
+    await new Promise(resolve => setTimeout(resolve, POLL_INTERVAL_MS));
+    const response = await fetch(`${serverUrl}/status/${taskId}`);
+    const data = await response.json();
+
+    if (data.state === 'SUCCESS' || data.state === 'FAILURE') {
+      return data;
+    }
+  }
+
+  return { success: false, error: 'Timed out waiting for the server' };
+}
+
 // Send article to Kindle immediately
 async function sendToKindle() {
   const serverUrl = await getServerUrl();
@@ -95,7 +113,10 @@ async function sendToKindle() {
       body: JSON.stringify({ url: tab.url })
     });
 
-    const data = await response.json();
+    let data = await response.json();
+    if (data.success && data.task_id) {
+      data = await waitForTask(serverUrl, data.task_id);
+    }
 
     if (data.success) {
       showStatus(`✓ "${data.title}" sent to Kindle!`, 'success');
@@ -4,23 +4,40 @@ Kindle Sender - Self-hosted article to Kindle service
 Receives article URLs, extracts content, converts to EPUB, and sends to Kindle.
 """
 
+import asyncio
+import atexit
+import base64
+import hashlib
+import json
 import os
-import smtplib
+import sqlite3
+import string
+import sys
 import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
 from email.mime.text import MIMEText
-from email import encoders
 from pathlib import Path
-
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import aiohttp
+import aiosmtplib
+import redis
+from cachetools import TTLCache
+from celery.result import AsyncResult
 from flask import Flask, request, jsonify
 from flask_cors import CORS
+from kombu.exceptions import OperationalError as BrokerError
 from dotenv import load_dotenv
-from newspaper import Article
+from newspaper import Article, Config
 from ebooklib import epub
-from bs4 import BeautifulSoup
-import requests
+from tasks import REDIS_URL, celery, send_article_task
 
 # Load environment variables from server/.env regardless of CWD
 ENV_PATH = Path(__file__).resolve().parent / ".env"
@@ -37,27 +54,367 @@ SMTP_PASSWORD = os.getenv('SMTP_PASSWORD')
 KINDLE_EMAIL = os.getenv('KINDLE_EMAIL')
 SERVER_PORT = int(os.getenv('SERVER_PORT', 5123))
 FROM_EMAIL = os.getenv('FROM_EMAIL')
+DEV = bool(os.getenv('DEV'))
+QUEUE_DB = os.getenv('QUEUE_DB', str(Path(__file__).resolve().parent / 'queue.db'))
+
+# The environment is only read at startup, so these never change
+CONFIG_OK_KINDLE = bool(KINDLE_EMAIL)
+CONFIG_OK_SMTP = bool(SMTP_USERNAME and SMTP_PASSWORD)
+CONFIG_OK_ALL = CONFIG_OK_KINDLE and CONFIG_OK_SMTP
+CONFIG_ERROR = 'Email configuration incomplete. Please set SMTP_USERNAME, SMTP_PASSWORD, and KINDLE_EMAIL in .env'
+
+# Outside development, refuse to start rather than fail every send
+if not CONFIG_OK_ALL and not DEV:
+    raise RuntimeError(CONFIG_ERROR)
+
+# Match the request settings newspaper3k used for its own downloads
+NEWSPAPER_CONFIG = Config()
+FETCH_HEADERS = {'User-Agent': NEWSPAPER_CONFIG.browser_user_agent, **NEWSPAPER_CONFIG.headers}
+
+# Article downloads: connection pool limits and retries for flaky hosts
+HTTP_POOL_SIZE = 64
+HTTP_RETRIES = 2
+HTTP_RETRY_BACKOFF = 0.3
+HTTP_RETRY_STATUSES = {429, 502, 503, 504}
+
+# newspaper parsing and EPUB building are CPU-bound; they run on one shared,
+# bounded pool instead of each request's event loop spinning up its own
+# default executor
+CPU_POOL = ThreadPoolExecutor(max_workers=os.cpu_count() or 4, thread_name_prefix='cpu')
+PARSE_TIMEOUT = 30
+
+# Max articles fetched/converted/sent at once when draining the queue
+QUEUE_CONCURRENCY = 8
+
+# Extracted articles, keyed by normalized URL. The local cache serves repeat
+# calls in this process; Redis shares entries with the Celery worker so a
+# preview followed by a send only downloads the page once.
+ARTICLE_CACHE_TTL = 60 * 60
+article_cache = TTLCache(maxsize=512, ttl=ARTICLE_CACHE_TTL)
+article_cache_lock = threading.Lock()
+redis_client = redis.Redis.from_url(REDIS_URL, socket_timeout=1, socket_connect_timeout=1)
+# redis-py blocks, so its calls run here rather than on the request's event loop
+CACHE_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix='cache')
+
+# Escapes text for HTML content and attribute values in a single pass
+HTML_ESCAPE = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;'})
+
+# Chapter page for an article; every substituted value is already escaped
+ARTICLE_TEMPLATE = string.Template("""
+    <html>
+    <head>
+        <title>$title</title>
+        <style>
+            body { font-family: Georgia, serif; line-height: 1.6; padding: 20px; }
+            h1 { margin-bottom: 10px; }
+            .meta { color: #666; font-size: 0.9em; margin-bottom: 20px; }
+            .content { text-align: justify; }
+            p { margin-bottom: 1em; }
+        </style>
+    </head>
+    <body>
+        <h1>$title</h1>
+        <div class="meta">
+            <p>Source: <a href="$url">$url</a></p>
+            $authors
+            $published
+        </div>
+        <div class="content">
+            $body
+        </div>
+    </body>
+    </html>
+""")
+
+
+class _FilenameChars(dict):
+    """str.translate table keeping letters, digits, space, '-' and '_'.
+
+    Entries are filled in the first time a character is seen, so later
+    lookups are plain dict hits inside translate's C loop.
+    """
+
+    def __missing__(self, codepoint: int) -> Optional[int]:
+        char = chr(codepoint)
+        self[codepoint] = codepoint if char.isalnum() or char in ' -_' else None
+        return self[codepoint]
+
+
+FILENAME_CHARS = _FilenameChars()
+
+# Generated EPUBs live in the system temp dir until they have been emailed
+EPUB_TEMP_PREFIX = 'kindle-sender-'
+STALE_EPUB_AGE = 60 * 60
+
+# The chapter is small text that Kindle inflates once; level 1 deflate is
+# several times faster than ebooklib's default level 6 for a slightly larger
+# file. raise_exceptions stops ebooklib from swallowing write errors.
+EPUB_WRITE_OPTIONS = {'compresslevel': 1, 'raise_exceptions': True}
+
+# Multiple of 57 bytes so every chunk encodes to whole 76-character base64 lines
+BASE64_CHUNK_SIZE = 57 * 1024
+
+# Queued articles live in SQLite so they survive restarts and are shared by
+# every server process. WAL lets readers carry on while a drain is writing.
+# The connection is shared by this process's request threads, hence the lock.
+# A drain claims rows before sending them; a claim older than
+# STALE_CLAIM_AGE is assumed to belong to a process that died mid-drain.
+STALE_CLAIM_AGE = 60 * 60
+queue_db = sqlite3.connect(QUEUE_DB, check_same_thread=False, isolation_level=None)
+queue_db.execute('PRAGMA journal_mode=WAL')
+queue_db.execute("""
+    CREATE TABLE IF NOT EXISTS queue (
+        url TEXT PRIMARY KEY,
+        title TEXT NOT NULL,
+        added_at REAL NOT NULL,
+        claimed_by TEXT,
+        claimed_at REAL,
+        etag TEXT,
+        last_modified TEXT,
+        article TEXT
+    )
+""")
+# Queue files created before the columns above existed
+_queue_columns = {row[1] for row in queue_db.execute('PRAGMA table_info(queue)')}
+for _column in ('etag', 'last_modified', 'article'):
+    if _column not in _queue_columns:
+        try:
+            queue_db.execute(f'ALTER TABLE queue ADD COLUMN {_column} TEXT')
+        except sqlite3.OperationalError as e:
+            # Another worker starting at the same time added it first
+            if 'duplicate column' not in str(e):
+                raise
+queue_db_lock = threading.Lock()
+
+
+def queue_add(url: str, article_data: dict) -> int:
+    """Add (or refresh) a queued article and return the queue length.
+
+    The extracted article is stored with the page's ETag/Last-Modified so
+    the drain can revalidate instead of downloading and parsing it again.
+    """
+    # The raw page HTML is not needed to build the EPUB
+    article = {key: value for key, value in article_data.items() if key != 'html'}
+    with queue_db_lock:
+        # Re-queueing an article that a drain has claimed must keep the claim,
+        # or a second drain would pick it up and send it again
+        queue_db.execute(
+            'INSERT INTO queue (url, title, added_at, etag, last_modified, article) '
+            'VALUES (?, ?, ?, ?, ?, ?) '
+            'ON CONFLICT(url) DO UPDATE SET title = excluded.title, added_at = excluded.added_at, '
+            'etag = excluded.etag, last_modified = excluded.last_modified, article = excluded.article',
+            (url, article_data['title'], time.time(),
+             article_data.get('etag'), article_data.get('last_modified'), json.dumps(article))
+        )
+        return queue_db.execute('SELECT COUNT(*) FROM queue').fetchone()[0]
+
+
+def queue_list() -> list:
+    """All queued articles, oldest first."""
+    with queue_db_lock:
+        rows = queue_db.execute('SELECT url, title, added_at FROM queue ORDER BY rowid').fetchall()
+    return [{'url': url, 'title': title, 'added_at': format_added_at(added_at)} for url, title, added_at in rows]
+
+
+def format_added_at(added_at) -> str:
+    """ISO timestamp for a queue row's added_at."""
+    try:
+        return datetime.fromtimestamp(float(added_at)).isoformat()
+    except ValueError:
+        return added_at  # Rows queued before added_at was stored as a timestamp
+
+
+def queue_count() -> int:
+    """Number of queued articles."""
+    with queue_db_lock:
+        return queue_db.execute('SELECT COUNT(*) FROM queue').fetchone()[0]
+
+
+def queue_claim(claim_id: str) -> list:
+    """Atomically claim every unclaimed article for one drain."""
+    now = time.time()
+    with queue_db_lock:
+        queue_db.execute(
+            'UPDATE queue SET claimed_by = ?, claimed_at = ? WHERE claimed_by IS NULL OR claimed_at < ?',
+            (claim_id, now, now - STALE_CLAIM_AGE)
+        )
+        rows = queue_db.execute(
+            'SELECT url, title, added_at, article FROM queue WHERE claimed_by = ? ORDER BY rowid', (claim_id,)
+        ).fetchall()
+    return [
+        {'url': url, 'title': title, 'added_at': added_at, 'article': json.loads(article) if article else None}
+        for url, title, added_at, article in rows
+    ]
+
+
+def queue_finish(claim_id: str, sent_urls: list) -> None:
+    """Delete sent articles and hand the rest of a claim back to the queue."""
+    with queue_db_lock:
+        queue_db.executemany(
+            'DELETE FROM queue WHERE url = ? AND claimed_by = ?',
+            [(url, claim_id) for url in sent_urls]
+        )
+        queue_db.execute(
+            'UPDATE queue SET claimed_by = NULL, claimed_at = NULL WHERE claimed_by = ?', (claim_id,)
+        )
+
+
+def queue_clear() -> None:
+    """Remove every queued article."""
+    with queue_db_lock:
+        queue_db.execute('DELETE FROM queue')
+
+
+def http_session() -> aiohttp.ClientSession:
+    """Create a pooled HTTP client session using newspaper's request settings."""
+    connector = aiohttp.TCPConnector(limit=HTTP_POOL_SIZE, ttl_dns_cache=300)
+    timeout = aiohttp.ClientTimeout(total=NEWSPAPER_CONFIG.request_timeout)
+    return aiohttp.ClientSession(connector=connector, headers=FETCH_HEADERS, timeout=timeout)
+
+
+async def fetch_html(url: str, session: Optional[aiohttp.ClientSession] = None,
+                     etag: Optional[str] = None, last_modified: Optional[str] = None) -> Optional[dict]:
+    """Download a page, reusing `session` if given.
+
+    Returns the HTML with the page's ETag/Last-Modified, or None if the
+    server confirms the copy identified by `etag`/`last_modified` is current.
+    """
+    if session is None:
+        async with http_session() as session:
+            return await fetch_html(url, session, etag, last_modified)
+
+    headers = {}
+    if etag:
+        headers['If-None-Match'] = etag
+    if last_modified:
+        headers['If-Modified-Since'] = last_modified
+
+    for attempt in range(HTTP_RETRIES + 1):
+        last_attempt = attempt == HTTP_RETRIES
+        try:
+            async with session.get(url, headers=headers) as response:
+                if response.status == 304 and headers:
+                    return None
+                if response.status not in HTTP_RETRY_STATUSES or last_attempt:
+                    response.raise_for_status()
+                    return {
+                        # Pages often declare the wrong charset; don't fail the whole article over it
+                        'html': await response.text(errors='replace'),
+                        'etag': response.headers.get('ETag'),
+                        'last_modified': response.headers.get('Last-Modified')
+                    }
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            if last_attempt:
+                raise
+
+        await asyncio.sleep(HTTP_RETRY_BACKOFF * 2 ** attempt)
+
+
+def parse_article(url: str, html: str) -> dict:
+    """Parse downloaded HTML with newspaper3k (CPU-bound)."""
+    article = Article(url)
+    article.set_html(html)
+    article.parse()
+
+    return {
+        'title': article.title or 'Untitled Article',
+        'authors': article.authors,
+        'publish_date': str(article.publish_date) if article.publish_date else None,
+        'text': article.text,
+        'html': article.html,
+        'top_image': article.top_image,
+        'url': url,
+        'success': True
+    }
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form of a URL for caching: no fragment or utm_* parameters."""
+    parts = urlsplit(url)
+    query = urlencode([
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith('utm_')
+    ])
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, query, ''))
 
-# Store for queued articles (in production, use a database)
-article_queue = []
 
+def _redis_cache_key(cache_key: str) -> str:
+    return f"articlecache:{hashlib.sha1(cache_key.encode()).hexdigest()}"
+
+
+async def get_cached_article(cache_key: str) -> Optional[dict]:
+    """Look up a previously extracted article."""
+    with article_cache_lock:
+        article_data = article_cache.get(cache_key)
+    if article_data is not None:
+        return dict(article_data)
+
+    try:
+        raw = await asyncio.get_running_loop().run_in_executor(
+            CACHE_POOL, redis_client.get, _redis_cache_key(cache_key)
+        )
+    except redis.RedisError:
+        return None
+    if raw is None:
+        return None
+
+    article_data = json.loads(raw)
+    with article_cache_lock:
+        article_cache[cache_key] = article_data
+    return dict(article_data)
+
+
+async def cache_article(cache_key: str, article_data: dict) -> None:
+    """Remember a successfully extracted article."""
+    with article_cache_lock:
+        article_cache[cache_key] = article_data
 
-def extract_article(url: str) -> dict:
-    """Extract article content from URL using newspaper3k."""
     try:
-        article = Article(url)
-        article.download()
-        article.parse()
+        await asyncio.get_running_loop().run_in_executor(
+            CACHE_POOL, redis_client.setex,
+            _redis_cache_key(cache_key), ARTICLE_CACHE_TTL, json.dumps(article_data)
+        )
+    except redis.RedisError:
+        pass  # The local cache still works without Redis
+
+
+async def extract_article(url: str, session: Optional[aiohttp.ClientSession] = None,
+                          previous: Optional[dict] = None) -> dict:
+    """Extract article content from URL using newspaper3k.
 
+    `previous` is an earlier extraction of the same URL; it is reused
+    without parsing if the server answers 304 Not Modified.
+    """
+    cache_key = normalize_url(url)
+    cached = await get_cached_article(cache_key)
+    if cached is not None:
+        return cached
+
+    try:
+        page = await fetch_html(
+            url, session,
+            previous.get('etag') if previous else None,
+            previous.get('last_modified') if previous else None
+        )
+        if page is None:
+            # The queued copy has no page HTML, so it must not be cached
+            # where /preview would serve it
+            return dict(previous)
+
+        article_data = await asyncio.wait_for(
+            asyncio.get_running_loop().run_in_executor(CPU_POOL, parse_article, url, page['html']),
+            PARSE_TIMEOUT
+        )
+        article_data['etag'] = page['etag']
+        article_data['last_modified'] = page['last_modified']
+        await cache_article(cache_key, article_data)
+        return dict(article_data)
+    except asyncio.TimeoutError:
+        # str() of a timeout is empty, which would leave the caller guessing
         return {
-            'title': article.title or 'Untitled Article',
-            'authors': article.authors,
-            'publish_date': str(article.publish_date) if article.publish_date else None,
-            'text': article.text,
-            'html': article.html,
-            'top_image': article.top_image,
-            'url': url,
-            'success': True
+            'success': False,
+            'error': 'Timed out fetching or parsing the article',
+            'url': url
         }
     except Exception as e:
         return {
@@ -73,7 +430,7 @@ def create_epub(article_data: dict) -> str:
 
     # Set metadata
     title = article_data.get('title', 'Untitled')
-    book.set_identifier(f"kindle-sender-{datetime.now().timestamp()}")
+    book.set_identifier(f"kindle-sender-{uuid.uuid4().hex}")
     book.set_title(title)
     book.set_language('en')
 
@@ -84,33 +441,22 @@ def create_epub(article_data: dict) -> str:
     else:
         book.add_author('Unknown')
 
-    # Create chapter content
+    # Create chapter content (everything interpolated below must be escaped)
     content = article_data.get('text', '')
-    html_content = f"""
-    <html>
-    <head>
-        <title>{title}</title>
-        <style>
-            body {{ font-family: Georgia, serif; line-height: 1.6; padding: 20px; }}
-            h1 {{ margin-bottom: 10px; }}
-            .meta {{ color: #666; font-size: 0.9em; margin-bottom: 20px; }}
-            .content {{ text-align: justify; }}
-            p {{ margin-bottom: 1em; }}
-        </style>
-    </head>
-    <body>
-        <h1>{title}</h1>
-        <div class="meta">
-            <p>Source: <a href="{article_data.get('url', '')}">{article_data.get('url', '')}</a></p>
-            {f"<p>Authors: {', '.join(authors)}</p>" if authors else ""}
-            {f"<p>Published: {article_data.get('publish_date')}</p>" if article_data.get('publish_date') else ""}
-        </div>
-        <div class="content">
-            {''.join(f'<p>{para}</p>' for para in content.split('\n\n') if para.strip())}
-        </div>
-    </body>
-    </html>
-    """
+    # Escape the whole text in one pass (escaping never touches newlines),
+    # then split and join once
+    paragraphs = [para for chunk in content.translate(HTML_ESCAPE).split('\n\n') if (para := chunk.strip())]
+    body_html = f"<p>{'</p><p>'.join(paragraphs)}</p>" if paragraphs else ''
+    authors_html = f"<p>Authors: {', '.join(authors).translate(HTML_ESCAPE)}</p>" if authors else ''
+    publish_date = article_data.get('publish_date')
+    published_html = f"<p>Published: {publish_date.translate(HTML_ESCAPE)}</p>" if publish_date else ''
+    html_content = ARTICLE_TEMPLATE.substitute(
+        title=title.translate(HTML_ESCAPE),
+        url=article_data.get('url', '').translate(HTML_ESCAPE),
+        authors=authors_html,
+        published=published_html,
+        body=body_html
+    )
 
     # Create chapter
     chapter = epub.EpubHtml(title=title, file_name='content.xhtml', lang='en')
@@ -126,48 +472,142 @@ def create_epub(article_data: dict) -> str:
     book.spine = ['nav', chapter]
 
     # Save to temp file
-    temp_dir = tempfile.mkdtemp()
-    safe_title = "".join(c for c in title if c.isalnum() or c in (' ', '-', '_')).rstrip()
-    epub_path = os.path.join(temp_dir, f"{safe_title[:50]}.epub")
-    epub.write_epub(epub_path, book)
+    with tempfile.NamedTemporaryFile(prefix=EPUB_TEMP_PREFIX, suffix='.epub', delete=False) as temp_file:
+        epub_path = temp_file.name
+    try:
+        epub.write_epub(epub_path, book, EPUB_WRITE_OPTIONS)
+    except Exception:
+        os.remove(epub_path)
+        raise
 
     return epub_path
 
 
-def send_to_kindle(epub_path: str, title: str) -> dict:
-    """Send EPUB file to Kindle via email."""
-    if not all([SMTP_USERNAME, SMTP_PASSWORD, KINDLE_EMAIL]):
-        return {
-            'success': False,
-            'error': 'Email configuration incomplete. Please set SMTP_USERNAME, SMTP_PASSWORD, and KINDLE_EMAIL in .env'
-        }
+def remove_stale_epubs() -> None:
+    """Delete leftover EPUBs from sends that never reached cleanup."""
+    cutoff = time.time() - STALE_EPUB_AGE
+    for path in Path(tempfile.gettempdir()).glob(f'{EPUB_TEMP_PREFIX}*.epub'):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+        except OSError:
+            pass
+
+
+atexit.register(remove_stale_epubs)
+
+
+def _smtp_client() -> aiosmtplib.SMTP:
+    """SMTP client for the configured server, not yet connected."""
+    # Port 465 is implicit TLS; anything else must upgrade with STARTTLS,
+    # so the login is never sent in cleartext if the offer is stripped
+    return aiosmtplib.SMTP(hostname=SMTP_SERVER, port=SMTP_PORT,
+                           use_tls=SMTP_PORT == 465, start_tls=SMTP_PORT != 465)
+
 
+async def _connect_smtp(smtp: aiosmtplib.SMTP) -> None:
+    """Connect and authenticate to the SMTP server."""
+    await smtp.connect()
     try:
-        msg = MIMEMultipart()
-        msg['From'] = FROM_EMAIL or SMTP_USERNAME
-        msg['To'] = KINDLE_EMAIL
-        msg['Subject'] = f'Kindle: {title}'
-
-        # Add body
-        body = f"Article: {title}\nSent via Kindle Sender"
-        msg.attach(MIMEText(body, 'plain'))
-
-        # Attach EPUB file
-        with open(epub_path, 'rb') as attachment:
-            part = MIMEBase('application', 'epub+zip')
-            part.set_payload(attachment.read())
-            encoders.encode_base64(part)
-            part.add_header(
-                'Content-Disposition',
-                f'attachment; filename="{os.path.basename(epub_path)}"'
-            )
-            msg.attach(part)
-
-        # Send email
-        with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
-            server.starttls()
-            server.login(SMTP_USERNAME, SMTP_PASSWORD)
-            server.send_message(msg)
+        await smtp.login(SMTP_USERNAME, SMTP_PASSWORD)
+    except Exception:
+        smtp.close()
+        raise
+
+
+async def _open_smtp() -> aiosmtplib.SMTP:
+    """Open an authenticated SMTP connection."""
+    smtp = _smtp_client()
+    await _connect_smtp(smtp)
+    return smtp
+
+
+async def _close_smtp(smtp: aiosmtplib.SMTP) -> None:
+    """End an SMTP session, dropping the socket if QUIT fails."""
+    if not smtp.is_connected:
+        return
+    try:
+        await smtp.quit()
+    except aiosmtplib.SMTPException:
+        smtp.close()
+
+
+def _build_message(epub_path: str, title: str) -> MIMEMultipart:
+    """Build the Kindle email with the EPUB attached."""
+    msg = MIMEMultipart()
+    msg['From'] = FROM_EMAIL or SMTP_USERNAME
+    msg['To'] = KINDLE_EMAIL
+    msg['Subject'] = f'Kindle: {title}'
+
+    # Add body
+    body = f"Article: {title}\nSent via Kindle Sender"
+    msg.attach(MIMEText(body, 'plain'))
+
+    # Attach EPUB file, base64-encoding it chunk by chunk straight into the
+    # payload string rather than reading it whole and encoding a second copy
+    with open(epub_path, 'rb') as attachment:
+        payload = ''.join(
+            base64.encodebytes(chunk).decode('ascii')
+            for chunk in iter(lambda: attachment.read(BASE64_CHUNK_SIZE), b'')
+        )
+
+    part = MIMEBase('application', 'epub+zip')
+    part.set_payload(payload)
+    part.add_header('Content-Transfer-Encoding', 'base64')
+    safe_title = title.translate(FILENAME_CHARS).rstrip()
+    part.add_header(
+        'Content-Disposition',
+        f'attachment; filename="{safe_title[:50] or "article"}.epub"'
+    )
+    msg.attach(part)
+
+    return msg
+
+
+async def _send(msg: MIMEMultipart, smtp: aiosmtplib.SMTP,
+                lock: Optional[asyncio.Lock] = None) -> None:
+    """Send a message over an open SMTP connection."""
+    # Serialize once and hand the bytes straight to sendmail rather than
+    # letting send_message flatten another copy
+    data = msg.as_bytes(policy=msg.policy.clone(linesep='\r\n'))
+    sender = msg['From']
+    recipients = [msg['To']]
+
+    if lock is None:
+        await smtp.sendmail(sender, recipients, data)
+        return
+
+    # A shared connection can only carry one MAIL/RCPT/DATA transaction at a time.
+    # It is connected on first use, so it is not left idle while articles are
+    # fetched, and reconnected once if the server dropped it between sends.
+    async with lock:
+        if not smtp.is_connected:
+            await _connect_smtp(smtp)
+        try:
+            await smtp.sendmail(sender, recipients, data)
+        except aiosmtplib.SMTPServerDisconnected:
+            await _connect_smtp(smtp)
+            await smtp.sendmail(sender, recipients, data)
+
+
+async def send_to_kindle(epub_path: str, title: str,
+                         smtp: Optional[aiosmtplib.SMTP] = None,
+                         smtp_lock: Optional[asyncio.Lock] = None) -> dict:
+    """Send EPUB file to Kindle via email, reusing `smtp` if given."""
+    if not CONFIG_OK_ALL:
+        return {'success': False, 'error': CONFIG_ERROR}
+
+    try:
+        msg = _build_message(epub_path, title)
+
+        if smtp is not None:
+            await _send(msg, smtp, smtp_lock)
+        else:
+            smtp = await _open_smtp()
+            try:
+                await _send(msg, smtp)
+            finally:
+                await _close_smtp(smtp)
 
         return {'success': True, 'message': f'Sent "{title}" to Kindle'}
 
@@ -184,46 +624,69 @@ def health_check():
     """Health check endpoint."""
     return jsonify({
         'status': 'ok',
-        'kindle_configured': bool(KINDLE_EMAIL),
-        'smtp_configured': bool(SMTP_USERNAME and SMTP_PASSWORD)
+        'kindle_configured': CONFIG_OK_KINDLE,
+        'smtp_configured': CONFIG_OK_SMTP
     })
 
 
+async def deliver_article(url: str, session: Optional[aiohttp.ClientSession] = None) -> dict:
+    """Extract an article, convert it to EPUB and send it to Kindle."""
+    article_data = await extract_article(url, session)
+    if not article_data.get('success'):
+        return article_data
+
+    try:
+        epub_path = await asyncio.get_running_loop().run_in_executor(
+            CPU_POOL, create_epub, article_data
+        )
+    except Exception as e:
+        return {'success': False, 'error': f'Failed to create EPUB: {str(e)}'}
+
+    result = await send_to_kindle(epub_path, article_data['title'])
+    if not result['success']:
+        return result
+
+    return {
+        'success': True,
+        'message': result['message'],
+        'title': article_data['title']
+    }
+
+
 @app.route('/send', methods=['POST'])
 def send_article():
-    """Extract article and send to Kindle immediately."""
+    """Queue an article for extraction and sending in the background."""
     data = request.get_json()
     url = data.get('url')
 
     if not url:
         return jsonify({'success': False, 'error': 'URL is required'}), 400
 
-    # Extract article
-    article_data = extract_article(url)
-    if not article_data.get('success'):
-        return jsonify(article_data), 400
-
-    # Create EPUB
     try:
-        epub_path = create_epub(article_data)
-    except Exception as e:
-        return jsonify({'success': False, 'error': f'Failed to create EPUB: {str(e)}'}), 500
+        task = send_article_task.delay(url)
+    except (BrokerError, RuntimeError):
+        # Celery's Redis result store raises RuntimeError when it cannot
+        # reconnect, which with a shared Redis happens before the broker fails
+        return jsonify({'success': False, 'error': 'Task queue unavailable, check that Redis is running'}), 503
+    return jsonify({'success': True, 'task_id': task.id}), 202
 
-    # Send to Kindle
-    result = send_to_kindle(epub_path, article_data['title'])
 
-    if result['success']:
-        return jsonify({
-            'success': True,
-            'message': result['message'],
-            'title': article_data['title']
-        })
-    else:
-        return jsonify(result), 500
+@app.route('/status/<task_id>', methods=['GET'])
+def task_status(task_id):
+    """Get the state of a background send started by /send."""
+    task = AsyncResult(task_id, app=celery)
+    response = {'task_id': task_id, 'state': task.state}
+
+    if task.successful():
+        response.update(task.result)
+    elif task.failed():
+        response.update({'success': False, 'error': str(task.result)})
+
+    return jsonify(response)
 
 
 @app.route('/queue', methods=['POST'])
-def queue_article():
+async def queue_article():
     """Add article to queue for batch sending later."""
     data = request.get_json()
     url = data.get('url')
@@ -232,75 +695,106 @@ def queue_article():
         return jsonify({'success': False, 'error': 'URL is required'}), 400
 
     # Extract article metadata
-    article_data = extract_article(url)
+    article_data = await extract_article(url)
     if not article_data.get('success'):
         return jsonify(article_data), 400
 
-    article_queue.append({
-        'url': url,
-        'title': article_data['title'],
-        'added_at': datetime.now().isoformat()
-    })
+    queue_length = queue_add(url, article_data)
 
     return jsonify({
         'success': True,
         'message': f'Added "{article_data["title"]}" to queue',
-        'queue_length': len(article_queue)
+        'queue_length': queue_length
     })
 
 
 @app.route('/queue', methods=['GET'])
 def get_queue():
     """Get current queue of articles."""
+    queue = queue_list()
+
     return jsonify({
         'success': True,
-        'queue': article_queue,
-        'count': len(article_queue)
+        'queue': queue,
+        'count': len(queue)
     })
 
 
 @app.route('/queue/send', methods=['POST'])
-def send_queue():
+async def send_queue():
     """Send all queued articles to Kindle."""
-    if not article_queue:
+    if not queue_count():
         return jsonify({'success': False, 'error': 'Queue is empty'}), 400
 
-    results = []
-    for item in article_queue[:]:  # Copy list to iterate safely
-        article_data = extract_article(item['url'])
-        if article_data.get('success'):
-            epub_path = create_epub(article_data)
-            result = send_to_kindle(epub_path, article_data['title'])
-            results.append({
+    semaphore = asyncio.Semaphore(QUEUE_CONCURRENCY)
+    smtp_lock = asyncio.Lock()
+
+    async def process(item: dict, session: aiohttp.ClientSession,
+                      smtp: Optional[aiosmtplib.SMTP]) -> dict:
+        async with semaphore:
+            article_data = await extract_article(item['url'], session, item['article'])
+            if not article_data.get('success'):
+                return {
+                    'url': item['url'],
+                    'success': False,
+                    'error': article_data.get('error')
+                }
+
+            try:
+                epub_path = await asyncio.get_running_loop().run_in_executor(
+                    CPU_POOL, create_epub, article_data
+                )
+            except Exception as e:
+                return {
+                    'title': article_data['title'],
+                    'success': False,
+                    'error': f'Failed to create EPUB: {str(e)}'
+                }
+
+            result = await send_to_kindle(epub_path, article_data['title'], smtp, smtp_lock)
+            return {
                 'title': article_data['title'],
                 'success': result['success'],
                 'error': result.get('error')
-            })
-            if result['success']:
-                article_queue.remove(item)
-        else:
-            results.append({
-                'url': item['url'],
-                'success': False,
-                'error': article_data.get('error')
-            })
+            }
+
+    # Claimed rows are invisible to other drains, so no article is sent twice
+    claim_id = uuid.uuid4().hex
+    items = queue_claim(claim_id)
+    if not items:
+        return jsonify({'success': False, 'error': 'Queue is already being sent'}), 409
+
+    # One SMTP connection for the whole batch, opened by the first send;
+    # send_to_kindle reports missing configuration per article when there
+    # is nothing to connect with
+    smtp = _smtp_client() if CONFIG_OK_ALL else None
+    results = []
+    try:
+        async with http_session() as session:
+            results = await asyncio.gather(*(process(item, session, smtp) for item in items))
+    finally:
+        if smtp is not None:
+            await _close_smtp(smtp)
+        queue_finish(claim_id, [item['url'] for item, result in zip(items, results) if result['success']])
+
+    remaining = queue_count()
 
     return jsonify({
         'success': True,
         'results': results,
-        'remaining_in_queue': len(article_queue)
+        'remaining_in_queue': remaining
     })
 
 
 @app.route('/queue/clear', methods=['DELETE'])
 def clear_queue():
     """Clear the article queue."""
-    article_queue.clear()
+    queue_clear()
     return jsonify({'success': True, 'message': 'Queue cleared'})
 
 
 @app.route('/preview', methods=['POST'])
-def preview_article():
+async def preview_article():
     """Preview extracted article without sending."""
     data = request.get_json()
     url = data.get('url')
@@ -308,18 +802,25 @@ def preview_article():
     if not url:
         return jsonify({'success': False, 'error': 'URL is required'}), 400
 
-    article_data = extract_article(url)
+    article_data = await extract_article(url)
     return jsonify(article_data)
 
 
 if __name__ == '__main__':
+    if not DEV:
+        sys.exit(
+            "Start the server with gunicorn:\n"
+            "    gunicorn -c gunicorn.conf.py app:app\n"
+            "or set DEV=1 to use the Flask development server."
+        )
+
     print(f"""
 ╔═══════════════════════════════════════════════════════════╗
 ║           Kindle Sender - Self-Hosted Server              ║
 ╠═══════════════════════════════════════════════════════════╣
 ║  Server running at: http://localhost:{SERVER_PORT}                 ║
 ║  Kindle email: {KINDLE_EMAIL or 'NOT CONFIGURED'}
-║  SMTP configured: {'Yes' if SMTP_USERNAME and SMTP_PASSWORD else 'No'}
+║  SMTP configured: {'Yes' if CONFIG_OK_SMTP else 'No'}
 ╚═══════════════════════════════════════════════════════════╝
     """)
     app.run(host='0.0.0.0', port=SERVER_PORT, debug=True)
@@ -0,0 +1,27 @@
+"""
+Kindle Sender - Gunicorn settings
+Start the server from the server directory with:
+    gunicorn -c gunicorn.conf.py app:app
+"""
+
+import os
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+# Load environment variables from server/.env regardless of CWD
+ENV_PATH = Path(__file__).resolve().parent / ".env"
+load_dotenv(dotenv_path=ENV_PATH)
+
+bind = f"0.0.0.0:{os.getenv('SERVER_PORT', 5123)}"
+
+# Threaded workers rather than gevent: the pipeline already runs on asyncio
+# (aiohttp/aiosmtplib), which gevent's monkey-patching does not mix with.
+# Each worker serves `threads` requests at once, and the queue lives in
+# SQLite, so every worker sees the same queue.
+worker_class = 'gthread'
+workers = int(os.getenv('WEB_CONCURRENCY', 4))
+threads = 8
+
+# gthread workers heartbeat from their main loop, so gunicorn's timeout
+# never cuts off a long /queue/send drain and is left at its default
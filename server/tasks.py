@@ -0,0 +1,70 @@
+"""
+Kindle Sender - Background tasks
+Runs the extract -> EPUB -> email pipeline outside the web request.
+
+Start a worker from the server directory with:
+    celery -A tasks worker --loglevel=info -c 8
+"""
+
+import asyncio
+import os
+from pathlib import Path
+
+from celery import Celery
+from celery.signals import worker_process_shutdown
+from dotenv import load_dotenv
+
+# Load environment variables from server/.env regardless of CWD
+ENV_PATH = Path(__file__).resolve().parent / ".env"
+load_dotenv(dotenv_path=ENV_PATH)
+
+REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+
+celery = Celery('kindle_sender', broker=REDIS_URL, backend=REDIS_URL)
+celery.conf.update(
+    task_track_started=True,
+    result_expires=24 * 60 * 60,
+)
+
+
+# aiohttp sessions belong to the event loop that created them, so each worker
+# process keeps one loop and one pooled session for its whole life. Articles
+# from the same site then reuse the open TCP/TLS connection.
+# Both are created lazily so they are never shared across Celery's fork.
+_loop = None
+_http_session = None
+
+
+async def _deliver(url: str) -> dict:
+    global _http_session
+    # Imported here because app.py imports this module
+    from app import deliver_article, http_session
+
+    if _http_session is None or _http_session.closed:
+        _http_session = http_session()
+    return await deliver_article(url, _http_session)
+
+
+@celery.task(name='kindle_sender.send_article')
+def send_article_task(url: str) -> dict:
+    """Extract article, build the EPUB and send it to Kindle."""
+    global _loop
+    if _loop is None:
+        _loop = asyncio.new_event_loop()
+    return _loop.run_until_complete(_deliver(url))
+
+
+@worker_process_shutdown.connect
+def close_http_session(**kwargs):
+    """Close this worker process's pooled session and event loop."""
+    if _loop is None:
+        return
+    if _http_session is not None and not _http_session.closed:
+        _loop.run_until_complete(_http_session.close())
+    _loop.close()
+
+
+# Importing app runs its configuration check, so a misconfigured worker
+# fails at boot instead of on its first task. app.py imports this module in
+# turn, which works because everything it needs is defined above.
+import app  # noqa: E402,F401
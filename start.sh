@@ -16,6 +16,11 @@ if ! command -v python3 &> /dev/null; then
     exit 1
 fi
 
+if ! python3 -c 'import sys; sys.exit(sys.version_info < (3, 9))'; then
+    echo "❌ Python 3.9 or newer is required (found $(python3 --version 2>&1))."
+    exit 1
+fi
+
 cd "$SERVER_DIR"
 
 # Create virtual environment if it doesn't exist
@@ -47,9 +52,15 @@ if [ ! -f ".env" ]; then
     ${EDITOR:-nano} .env
 fi
 
+echo ""
+echo "⚙️  Starting background worker..."
+celery -A tasks worker --loglevel=warning -c 8 &
+WORKER_PID=$!
+trap 'kill $WORKER_PID 2>/dev/null' EXIT
+
 echo ""
 echo "🚀 Starting Kindle Sender server..."
 echo "   Press Ctrl+C to stop"
 echo ""
 
-python app.py
+gunicorn -c gunicorn.conf.py app:app